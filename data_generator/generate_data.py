@@ -1,14 +1,14 @@
 
 import os
-import random
+import csv
 import math
 import datetime
-import uuid
 import yaml
 from pathlib import Path
 import numpy as np
 import pandas as pd
-from tqdm import tqdm
+import pyarrow as pa
+from pyarrow import csv as pacsv
 from faker import Faker
 
 # Load config.yaml (if absent, use defaults)
@@ -26,7 +26,7 @@ else:
         "products": 5000,
         "categories": 50,
         "suppliers": 200,
-        "stock_current_records": 100000,
+        "stock_current_records": 40000,
         "stock_movements": 500000,
         "purchase_orders": 100000,
         "sales_orders": 200000,
@@ -35,166 +35,220 @@ else:
         "price_max": 5000000,
         "max_stock_per_record": 500,
         "data_quality_pct": 0.05,
-        "random_seed": 42
+        "random_seed": 42,
+        "chunk_size": 50000
     }
 
-random.seed(config.get("random_seed", 42))
-np.random.seed(config.get("random_seed", 42))
+rng = np.random.default_rng(config.get("random_seed", 42))
 fake = Faker()
 out_dir = base_dir / "output"
 out_dir.mkdir(parents=True, exist_ok=True)
 
-def rand_date(start, end):
-    start_u = int(start.strftime("%s"))
-    end_u = int(end.strftime("%s"))
-    return datetime.datetime.fromtimestamp(random.randint(start_u, end_u)).date()
+def write_csv(df, path):
+    # Arrow's C++ CSV writer instead of pandas' row-wise writer
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), path)
+
+def write_csv_chunks(path, chunks):
+    # stream DataFrame chunks into one CSV so large tables never sit fully in memory
+    writer = None
+    try:
+        for df in chunks:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pacsv.CSVWriter(path, schema)
+            writer.write_table(table.cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
+
+def write_rows(path, header, rows):
+    # small master tables: plain csv module, no DataFrame round-trip
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
 
 start_date = datetime.datetime.fromisoformat(config["start_date"]).date()
 end_date = datetime.datetime.fromisoformat(config["end_date"]).date()
+start_ts = int(np.datetime64(start_date, "s").astype(np.int64))
+end_ts = int(np.datetime64(end_date, "s").astype(np.int64))
+
+def rand_dates(n):
+    # n ISO dates drawn uniformly between start_date and end_date (unix seconds, UTC)
+    ts = rng.integers(start_ts, end_ts + 1, size=n)
+    return pd.to_datetime(ts, unit="s").strftime("%Y-%m-%d").to_numpy()
 
 # 1) Warehouses
-warehouses = [{"warehouse_id": i, "warehouse_code": f"WH{i:02d}", "name": f"Warehouse {i}"} for i in range(1, config["warehouses"]+1)]
-pd.DataFrame(warehouses).to_csv(out_dir / "warehouses.csv", index=False)
+warehouses = [(i, f"WH{i:02d}", f"Warehouse {i}") for i in range(1, config["warehouses"]+1)]
+write_rows(out_dir / "warehouses.csv", ["warehouse_id", "warehouse_code", "name"], warehouses)
 
 # 2) Categories
-categories = [{"category_id": i, "category_name": f"Category {i}", "season_peak_month": random.randint(1,12)} for i in range(1, config["categories"]+1)]
-categories_df = pd.DataFrame(categories)
-categories_df.to_csv(out_dir / "categories.csv", index=False)
+peak_arr = rng.integers(1, 13, size=config["categories"])
+categories = [(i, f"Category {i}", int(peak)) for i, peak in enumerate(peak_arr, start=1)]
+write_rows(out_dir / "categories.csv", ["category_id", "category_name", "season_peak_month"], categories)
 
 # 3) Suppliers
-suppliers = [{"supplier_id": i, "supplier_name": fake.company(), "contact": fake.phone_number()} for i in range(1, config["suppliers"]+1)]
-pd.DataFrame(suppliers).to_csv(out_dir / "suppliers.csv", index=False)
+suppliers = [(i, fake.company(), fake.phone_number()) for i in range(1, config["suppliers"]+1)]
+write_rows(out_dir / "suppliers.csv", ["supplier_id", "supplier_name", "contact"], suppliers)
 
 # 4) Products with movement_weight for 80/20
 P = config["products"]
 top20 = int(P * 0.2)
 movement_weight = np.ones(P)
 movement_weight[:top20] = 5.0
-np.random.shuffle(movement_weight)
-
-products = []
-for pid in range(1, P+1):
-    cat = random.randint(1, config["categories"])
-    supplier = random.randint(1, config["suppliers"])
-    # price lognormal for long tail then clamp
-    price = int(np.round(np.random.lognormal(mean=10, sigma=0.8)))
-    price = max(config["price_min"], min(price, config["price_max"]))
-    products.append({
-        "product_id": pid,
-        "sku": f"SKU-{pid:06d}",
-        "product_name": f"Product {pid}",
-        "category_id": cat,
-        "supplier_id": supplier,
-        "price": price,
-        "movement_weight": float(movement_weight[pid-1])
-    })
-products_df = pd.DataFrame(products)
-products_df.to_csv(out_dir / "products.csv", index=False)
+rng.shuffle(movement_weight)
+
+product_ids = np.arange(1, P+1)
+# price lognormal for long tail then clamp
+prices = np.clip(np.round(rng.lognormal(mean=10, sigma=0.8, size=P)), config["price_min"], config["price_max"]).astype(int)
+products_df = pd.DataFrame({
+    "product_id": product_ids,
+    "sku": [f"SKU-{pid:06d}" for pid in product_ids],
+    "product_name": [f"Product {pid}" for pid in product_ids],
+    "category_id": rng.integers(1, config["categories"]+1, size=P),
+    "supplier_id": rng.integers(1, config["suppliers"]+1, size=P),
+    "price": prices,
+    "movement_weight": movement_weight.astype(float)
+})
+write_csv(products_df, out_dir / "products.csv")
 
 # 5) Stock current
-stock_records = []
-for i in tqdm(range(config["stock_current_records"]), desc="stock_current"):
-    wid = random.randint(1, config["warehouses"])
-    pid = random.randint(1, P)
-    qty = random.randint(0, config["max_stock_per_record"])
-    reorder_point = random.choice([0,5,10,20,50])
-    stock_records.append({"stock_id": i+1, "warehouse_id": wid, "product_id": pid, "quantity": qty, "reorder_point": reorder_point, "last_updated": rand_date(start_date,end_date).isoformat()})
-pd.DataFrame(stock_records).to_csv(out_dir / "stock_current.csv", index=False)
+# one record per (product, warehouse) pair, as in the stock table's UNIQUE constraint:
+# sample distinct pair ids directly (fast movers more likely) and decode them
+W = config["warehouses"]
+S = config["stock_current_records"]
+if S > P * W:
+    print(f"Warning: stock_current_records={S} exceeds the {P * W} (product, warehouse) pairs; capping at {P * W}")
+    S = P * W
+pair_weights = np.repeat(movement_weight, W)
+pair_ids = np.sort(rng.choice(P * W, size=S, replace=False, p=pair_weights / pair_weights.sum()))
+stock_df = pd.DataFrame({
+    "stock_id": np.arange(1, S+1),
+    "warehouse_id": pair_ids % W + 1,
+    "product_id": pair_ids // W + 1,
+    "quantity": rng.integers(0, config["max_stock_per_record"]+1, size=S),
+    "reorder_point": rng.choice([0,5,10,20,50], size=S),
+    "last_updated": rand_dates(S)
+})
+write_csv(stock_df, out_dir / "stock_current.csv")
 
 # 6) Stock movements
 movement_types = ['IN','OUT','TRANSFER','ADJUSTMENT','RETURN']
-movements = []
+movement_type_cum_weights = [0.4, 0.85, 0.9, 0.95, 1.0]
 movement_count = config["stock_movements"]
 weights = products_df["movement_weight"].values.astype(float)
 weights = weights / weights.sum()
+# cumulative weights computed once; product picks are drawn in batches via searchsorted
+product_cdf = np.cumsum(weights)
+product_cdf[-1] = 1.0
+price_arr = products_df["price"].to_numpy()
+cats_arr = products_df["category_id"].to_numpy()
+
+def draw_products(n):
+    return product_ids[np.searchsorted(product_cdf, rng.random(n), side="right")]
+
+def movement_chunks(chunk_size):
+    for start in range(0, movement_count, chunk_size):
+        n = min(chunk_size, movement_count - start)
+        pids = draw_products(n)
+        cat_peak = peak_arr[cats_arr[pids-1]-1]
+        months = np.where(rng.random(n) < 0.25, cat_peak, rng.integers(1, 13, size=n))
+        years = rng.integers(start_date.year, end_date.year+1, size=n)
+        days = rng.integers(1, 29, size=n)
+        mov_dates = pd.to_datetime(pd.DataFrame({"year": years, "month": months, "day": days})).dt.strftime("%Y-%m-%d")
+        mtypes = np.array(movement_types)[np.searchsorted(movement_type_cum_weights, rng.random(n), side="right")]
+        qty = np.abs((rng.poisson(lam=5, size=n) * np.where(mtypes == 'IN', 1.5, 1) + 1).astype(int))
+        spikes = (mtypes == 'OUT') & (rng.random(n) < 0.02)
+        qty[spikes] *= rng.integers(5, 21, size=spikes.sum())
+        # 8-hex-char references from one batch of random 32-bit ints (cheaper than uuid4 per row)
+        ref_ints = rng.integers(0, 2**32, size=n, dtype=np.uint64)
+        mov_df = pd.DataFrame({
+            "movement_id": np.arange(start+1, start+n+1),
+            "movement_date": mov_dates.to_numpy(),
+            "warehouse_id": rng.integers(1, config["warehouses"]+1, size=n),
+            "product_id": pids,
+            "movement_type": mtypes,
+            "quantity": qty.astype(float),
+            "reference": [f"{v:08x}" for v in ref_ints]
+        })
+        # Insert data quality issues (~data_quality_pct)
+        dq_n = int(n * config["data_quality_pct"])
+        if dq_n > 0:
+            idxs = rng.choice(mov_df.index, size=dq_n, replace=False)
+            # four disjoint groups (same j % 4 split as before), each patched with one vectorized assignment
+            g_null, g_neg, g_trunc, g_dup = (idxs[k::4] for k in range(4))
+            mov_df.loc[g_null, "quantity"] = np.nan
+            mov_df.loc[g_neg, "quantity"] = -mov_df.loc[g_neg, "quantity"].abs().clip(lower=1)
+            # duplicates copy the previous row's reference as generated (before truncation)
+            prev_ref = mov_df["reference"].shift(1).fillna(mov_df["reference"].iloc[0])
+            mov_df.loc[g_trunc, "reference"] = mov_df.loc[g_trunc, "reference"].str[:4]
+            mov_df.loc[g_dup, "reference"] = prev_ref.loc[g_dup].to_numpy()
+        yield mov_df
+
+def order_detail_chunks(order_ids, order_lines, id_col, order_col, max_qty, chunk_size):
+    # one detail row per order line: header ids repeated by their line count;
+    # chunks are cut on order boundaries so an order's lines stay together
+    offsets = np.concatenate(([0], np.cumsum(order_lines)))
+    for start in range(0, len(order_ids), chunk_size):
+        stop = min(start + chunk_size, len(order_ids))
+        n = int(offsets[stop] - offsets[start])
+        pids = draw_products(n)
+        yield pd.DataFrame({
+            id_col: np.arange(offsets[start]+1, offsets[stop]+1),
+            order_col: np.repeat(order_ids[start:stop], order_lines[start:stop]),
+            "product_id": pids,
+            "quantity": rng.integers(1, max_qty+1, size=n),
+            "unit_price": (price_arr[pids-1] * (0.9 + rng.random(n)*0.3)).astype(int)
+        })
 
-for i in tqdm(range(movement_count), desc="stock_movements"):
-    pid = int(np.random.choice(products_df["product_id"], p=weights))
-    prod_row = products_df.iloc[pid-1]
-    wid = random.randint(1, config["warehouses"])
-    cat_peak = categories_df.loc[categories_df['category_id']==prod_row['category_id'],'season_peak_month'].iloc[0]
-    month = cat_peak if random.random() < 0.25 else random.randint(1,12)
-    year = random.randint(start_date.year, end_date.year)
-    day = random.randint(1,28)
-    mov_date = datetime.date(year, month, day)
-    mtype = random.choices(movement_types, weights=[0.4,0.45,0.05,0.05,0.05])[0]
-    qty = int(abs(int(np.random.poisson(lam=5) * (1 if mtype!='IN' else 1.5) + 1)))
-    if mtype == 'OUT' and random.random() < 0.02:
-        qty *= random.randint(5,20)
-    ref = str(uuid.uuid4())[:8]
-    movements.append({"movement_id": i+1, "movement_date": mov_date.isoformat(), "warehouse_id": wid, "product_id": pid, "movement_type": mtype, "quantity": qty, "reference": ref})
-
-mov_df = pd.DataFrame(movements)
-# Insert data quality issues (~data_quality_pct)
-dq_n = int(len(mov_df) * config["data_quality_pct"])
-if dq_n > 0:
-    idxs = np.random.choice(mov_df.index, size=dq_n, replace=False)
-    for j, idx in enumerate(idxs):
-        choice = j % 4
-        if choice == 0:
-            mov_df.at[idx, "quantity"] = None
-        elif choice == 1:
-            mov_df.at[idx, "quantity"] = -abs(int(mov_df.at[idx, "quantity"] or 1))
-        elif choice == 2:
-            mov_df.at[idx, "reference"] = mov_df.at[idx, "reference"][:4]
-        else:
-            mov_df.at[idx, "reference"] = mov_df.at[max(0, idx-1), "reference"]
-mov_df.to_csv(out_dir / "stock_movements.csv", index=False)
+chunk_size = config.get("chunk_size", 50_000)
+write_csv_chunks(out_dir / "stock_movements.csv", movement_chunks(chunk_size))
 
 # 7) Purchase Orders & details
 po_count = config["purchase_orders"]
-po_headers = []
-po_details = []
-detail_id = 0
-for i in tqdm(range(po_count), desc="purchase_orders"):
-    po_id = i+1
-    date = rand_date(start_date, end_date)
-    supplier_id = random.randint(1, config["suppliers"])
-    warehouse_id = random.randint(1, config["warehouses"])
-    lines = random.randint(1,5)
-    po_headers.append({"po_id": po_id, "po_date": date.isoformat(), "supplier_id": supplier_id, "warehouse_id": warehouse_id, "total_lines": lines})
-    for _ in range(lines):
-        detail_id += 1
-        prod = int(np.random.choice(products_df["product_id"], p=weights))
-        qty = random.randint(1,100)
-        unit_price = int(products_df.at[prod-1, "price"] * (0.9 + random.random()*0.3))
-        po_details.append({"po_detail_id": detail_id, "po_id": po_id, "product_id": prod, "quantity": qty, "unit_price": unit_price})
-pd.DataFrame(po_headers).to_csv(out_dir / "purchase_orders.csv", index=False)
-pd.DataFrame(po_details).to_csv(out_dir / "purchase_order_details.csv", index=False)
+po_ids = np.arange(1, po_count+1)
+po_lines = rng.integers(1, 6, size=po_count)
+po_df = pd.DataFrame({
+    "po_id": po_ids,
+    "po_date": rand_dates(po_count),
+    "supplier_id": rng.integers(1, config["suppliers"]+1, size=po_count),
+    "warehouse_id": rng.integers(1, config["warehouses"]+1, size=po_count),
+    "total_lines": po_lines
+})
+write_csv(po_df, out_dir / "purchase_orders.csv")
+write_csv_chunks(out_dir / "purchase_order_details.csv",
+                 order_detail_chunks(po_ids, po_lines, "po_detail_id", "po_id", 100, chunk_size))
 
 # 8) Sales Orders & details
 so_count = config["sales_orders"]
-so_headers = []
-so_details = []
-detail_id = 0
-for i in tqdm(range(so_count), desc="sales_orders"):
-    so_id = i+1
-    date = rand_date(start_date, end_date)
-    warehouse_id = random.randint(1, config["warehouses"])
-    customer = fake.name()
-    lines = random.randint(1,5)
-    so_headers.append({"so_id": so_id, "so_date": date.isoformat(), "warehouse_id": warehouse_id, "customer": customer, "total_lines": lines})
-    for _ in range(lines):
-        detail_id += 1
-        prod = int(np.random.choice(products_df["product_id"], p=weights))
-        qty = random.randint(1,20)
-        unit_price = int(products_df.at[prod-1, "price"] * (0.9 + random.random()*0.3))
-        so_details.append({"so_detail_id": detail_id, "so_id": so_id, "product_id": prod, "quantity": qty, "unit_price": unit_price})
-pd.DataFrame(so_headers).to_csv(out_dir / "sales_orders.csv", index=False)
-pd.DataFrame(so_details).to_csv(out_dir / "sales_order_details.csv", index=False)
+so_ids = np.arange(1, so_count+1)
+# customers are sampled from a pre-generated pool rather than calling Faker per order
+customer_pool = [fake.name() for _ in range(min(so_count, 10_000))]
+so_lines = rng.integers(1, 6, size=so_count)
+so_df = pd.DataFrame({
+    "so_id": so_ids,
+    "so_date": rand_dates(so_count),
+    "warehouse_id": rng.integers(1, config["warehouses"]+1, size=so_count),
+    "customer": rng.choice(customer_pool, size=so_count),
+    "total_lines": so_lines
+})
+write_csv(so_df, out_dir / "sales_orders.csv")
+write_csv_chunks(out_dir / "sales_order_details.csv",
+                 order_detail_chunks(so_ids, so_lines, "so_detail_id", "so_id", 20, chunk_size))
 
 # 9) Validation summary
 summary = {
     "warehouses": len(warehouses),
     "categories": len(categories),
     "suppliers": len(suppliers),
-    "products": len(products),
-    "stock_current": len(stock_records),
-    "stock_movements": len(movements),
-    "purchase_orders": len(po_headers),
-    "purchase_order_details": len(po_details),
-    "sales_orders": len(so_headers),
-    "sales_order_details": len(so_details),
+    "products": len(products_df),
+    "stock_current": len(stock_df),
+    "stock_movements": movement_count,
+    "purchase_orders": len(po_df),
+    "purchase_order_details": int(po_lines.sum()),
+    "sales_orders": len(so_df),
+    "sales_order_details": int(so_lines.sum()),
     "data_quality_issues_pct": config.get("data_quality_pct", 0.05)
 }
 with open(out_dir / "data_validation_summary.yaml", "w") as f:
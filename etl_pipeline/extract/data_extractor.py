@@ -4,15 +4,32 @@ import json
 import logging
 from pathlib import Path
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pacsv
 from sqlalchemy import create_engine, text
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import connectorx as cx
+except ImportError:  # optional: fall back to pandas.read_sql
+    cx = None
 
 logger = logging.getLogger("etl.extract")
 
+# Arrow string columns come through to pandas as Arrow-backed strings instead of object arrays
+ARROW_STRING = pd.StringDtype("pyarrow")
+_ARROW_TYPES = {pa.string(): ARROW_STRING, pa.large_string(): ARROW_STRING}.get
+TEXT_COLUMNS = ["movement_type", "product_id", "site_id"]
+
 class DataExtractor:
     def __init__(self, cfg: dict):
         self.cfg = cfg
         self.state_file = Path(cfg.get("incremental", {}).get("state_file", ".etl_state.json"))
+        # engine and compiled statements are created on first use and reused across extract() calls
+        self._engine = None
+        self._stmts = {}
 
     def _load_state(self):
         if self.state_file.exists():
@@ -33,17 +50,13 @@ class DataExtractor:
         # Postgres extract
         inventory_df = pd.DataFrame()
         if postgres_cfg.get("enabled"):
-            pw = os.getenv(postgres_cfg.get("password_env", ""), "")
-            conn_str = f"postgresql+psycopg2://{postgres_cfg['user']}:{pw}@{postgres_cfg['host']}:{postgres_cfg['port']}/{postgres_cfg['database']}"
-            engine = create_engine(conn_str, pool_pre_ping=True)
             inc_col = postgres_cfg.get("incremental_column", "last_updated")
             last = state.get("postgres_last", None)
             if last is None:
                 lookback = timedelta(days=self.cfg.get("incremental", {}).get("default_lookback_days", 7))
                 last = (datetime.utcnow() - lookback).isoformat()
-            query = text(f"SELECT * FROM {postgres_cfg['incremental_table']} WHERE {inc_col} >= :last")
             try:
-                inventory_df = pd.read_sql(query, engine, params={"last": last})
+                inventory_df = self._read_postgres(postgres_cfg, inc_col, last)
                 logger.info(f"Extracted {len(inventory_df)} rows from Postgres since {last}")
             except Exception as e:
                 logger.error(f"Failed to extract from Postgres: {e}")
@@ -58,23 +71,139 @@ class DataExtractor:
                 logger.warning(f"CSV path not found: {path}")
             else:
                 try:
-                    movements_df = pd.read_csv(path, parse_dates=[csv_cfg.get("incremental_column")])
+                    tcol = csv_cfg.get("incremental_column")
+                    # Arrow's multi-threaded reader; the incremental filter runs on the Arrow table
+                    # so only new rows are materialized as pandas
+                    table = pacsv.read_csv(path, convert_options=pacsv.ConvertOptions(column_types={tcol: pa.string()}))
+                    ts = pa.array(self._parse_timestamps(table[tcol].to_pandas(), tcol))
+                    table = table.set_column(table.schema.get_field_index(tcol), tcol, ts)
                     last_csv = state.get("csv_last", None)
                     if last_csv:
-                        movements_df = movements_df[pd.to_datetime(movements_df[csv_cfg.get("incremental_column")]) >= pd.to_datetime(last_csv)]
+                        cutoff = pa.scalar(pd.Timestamp(last_csv), type=ts.type)
+                        table = table.filter(pc.greater_equal(table[tcol], cutoff))
+                    movements_df = table.to_pandas(split_blocks=True, self_destruct=True, types_mapper=_ARROW_TYPES)
                     logger.info(f"Loaded {len(movements_df)} rows from CSV")
                 except Exception as e:
                     logger.error(f"Failed to read CSV: {e}")
                     movements_df = pd.DataFrame()
                 state["csv_last"] = datetime.utcnow().isoformat()
 
-        # Basic data quality
+        # Basic data quality; column names are normalized here once, the transforms rely on it
         inventory_df = self._clean_inventory(inventory_df)
         movements_df = self._clean_movements(movements_df)
 
         self._save_state(state)
         return inventory_df, movements_df
 
+    @staticmethod
+    def _parse_timestamps(raw: pd.Series, col: str) -> pd.Series:
+        # the format is inferred from the data (as pandas.read_csv(parse_dates=...) did); values that
+        # don't fit the inferred format get a per-value retry, and anything still unparseable becomes
+        # NaT instead of failing the whole load
+        parsed = pd.to_datetime(raw, errors="coerce")
+        retry = parsed.isna() & raw.notna() & (raw != "")
+        if retry.any():
+            parsed[retry] = pd.to_datetime(raw[retry], format="mixed", errors="coerce")
+            bad = int((parsed.isna() & retry).sum())
+            if bad:
+                logger.warning(f"{bad} value(s) in {col} could not be parsed as timestamps")
+        return parsed
+
+    def _read_postgres(self, postgres_cfg: dict, inc_col: str, last: str) -> pd.DataFrame:
+        pw = os.getenv(postgres_cfg.get("password_env", ""), "")
+        dsn = f"{postgres_cfg['user']}:{pw}@{postgres_cfg['host']}:{postgres_cfg['port']}/{postgres_cfg['database']}"
+        tbl = postgres_cfg["incremental_table"]
+        partitions = max(1, int(postgres_cfg.get("partitions", 1)))
+        engine = self._get_engine(dsn, partitions)
+        ranges = self._partition_ranges(engine, tbl, inc_col, last, partitions)
+        if cx is not None:
+            # ConnectorX reads the binary protocol straight into Arrow buffers and runs a list of
+            # queries in parallel; it has no bind params, so the bounds (ISO timestamps we produced
+            # ourselves) are inlined as literals
+            queries = [self._range_sql(tbl, inc_col, lo, hi) for lo, hi in ranges]
+            try:
+                table = cx.read_sql(f"postgresql://{dsn}", queries if len(queries) > 1 else queries[0], return_type="arrow")
+                return table.to_pandas(split_blocks=True, self_destruct=True, types_mapper=_ARROW_TYPES)
+            except Exception as e:
+                logger.warning(f"ConnectorX extract failed, falling back to pandas.read_sql: {e}")
+
+        batch_size = int(postgres_cfg.get("batch_size", 100_000))
+
+        def read_range(bounds):
+            lo, hi = bounds
+            sql = f"SELECT * FROM {tbl} WHERE {inc_col} >= :lo" + (f" AND {inc_col} < :hi" if hi else "")
+            # server-side cursor: rows arrive in batch_size chunks instead of one client-side buffer
+            with engine.connect().execution_options(stream_results=True) as conn:
+                frames = list(pd.read_sql(self._stmt(sql), conn, params={"lo": lo, "hi": hi}, chunksize=batch_size))
+            return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+        if len(ranges) == 1:
+            return read_range(ranges[0])
+        # one connection per range; the server scans the ranges concurrently
+        with ThreadPoolExecutor(max_workers=len(ranges)) as ex:
+            frames = list(ex.map(read_range, ranges))
+        return pd.concat(frames, ignore_index=True)
+
+    def _get_engine(self, dsn: str, partitions: int):
+        if self._engine is None:
+            self._engine = create_engine(
+                f"postgresql+psycopg2://{dsn}",
+                pool_size=max(5, partitions),
+                pool_pre_ping=True,
+                pool_recycle=1800,
+            )
+        return self._engine
+
+    def _stmt(self, sql: str):
+        stmt = self._stmts.get(sql)
+        if stmt is None:
+            stmt = self._stmts[sql] = text(sql)
+        return stmt
+
+    def _partition_ranges(self, engine, tbl: str, inc_col: str, last: str, partitions: int) -> list:
+        # split [last, MAX(inc_col)] into equal time ranges; the final range is open-ended so rows
+        # written after the MAX probe are still picked up
+        if partitions <= 1:
+            return [(last, None)]
+        with engine.connect() as conn:
+            upper = conn.execute(self._stmt(f"SELECT MAX({inc_col}) FROM {tbl} WHERE {inc_col} >= :last"), {"last": last}).scalar()
+        if upper is None:
+            return [(last, None)]
+        upper = pd.Timestamp(upper)
+        if upper.tzinfo is not None:
+            upper = upper.tz_convert("UTC").tz_localize(None)
+        lower = pd.Timestamp(last)
+        if upper <= lower:
+            return [(last, None)]
+        edges = [e.isoformat() for e in pd.date_range(lower, upper, periods=partitions + 1)]
+        edges[0] = last
+        return [(edges[i], edges[i + 1] if i < partitions - 1 else None) for i in range(partitions)]
+
+    @staticmethod
+    def _range_sql(tbl: str, inc_col: str, lo: str, hi) -> str:
+        def quote(v):
+            return "'" + str(v).replace("'", "''") + "'"
+        sql = f"SELECT * FROM {tbl} WHERE {inc_col} >= {quote(lo)}"
+        if hi:
+            sql += f" AND {inc_col} < {quote(hi)}"
+        return sql
+
+    @staticmethod
+    def _arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+        # pandas.read_sql hands text back as object arrays (pandas 2) or the default str dtype
+        # (pandas 3); only columns that really hold strings are converted (numeric ids stay numeric)
+        for c in TEXT_COLUMNS:
+            if c not in df.columns:
+                continue
+            s = df[c]
+            if s.dtype == ARROW_STRING or isinstance(s.dtype, pd.CategoricalDtype):
+                continue
+            if pd.api.types.is_string_dtype(s) or (
+                pd.api.types.is_object_dtype(s) and pd.api.types.infer_dtype(s, skipna=True) == "string"
+            ):
+                df[c] = s.astype(ARROW_STRING)
+        return df
+
     def _clean_inventory(self, df: pd.DataFrame) -> pd.DataFrame:
         if df is None or df.empty:
             return pd.DataFrame()
@@ -84,12 +213,19 @@ class DataExtractor:
         missing = [c for c in required if c not in df.columns]
         if missing:
             logger.warning(f"Inventory missing columns: {missing}")
+        df = self._arrow_strings(df)
         if "quantity" in df.columns:
             df["quantity"] = pd.to_numeric(df["quantity"], errors="coerce").fillna(0).astype(float)
         if "unit_cost" in df.columns:
             df["unit_cost"] = pd.to_numeric(df["unit_cost"], errors="coerce").fillna(0.0)
         if "last_updated" in df.columns:
             df["last_updated"] = pd.to_datetime(df["last_updated"], errors="coerce")
+        if "site_id" in df.columns:
+            # a handful of warehouses: stored as category codes
+            df["site_id"] = df["site_id"].astype("category")
+        if "product_id" in df.columns:
+            # sorted once here so the sort=False product groupings downstream still come out in id order
+            df = df.sort_values("product_id", kind="stable", ignore_index=True)
         return df
 
     def _clean_movements(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -97,6 +233,7 @@ class DataExtractor:
             return pd.DataFrame()
         df = df.copy()
         df.columns = [c.strip().lower() for c in df.columns]
+        df = self._arrow_strings(df)
         tcol = self.cfg["sources"]["csv"].get("incremental_column", "modified_date")
         if tcol in df.columns:
             df[tcol] = pd.to_datetime(df[tcol], errors="coerce")
@@ -104,4 +241,7 @@ class DataExtractor:
             df = df.dropna(subset=["product_id"])
         if "quantity" in df.columns:
             df["quantity"] = pd.to_numeric(df["quantity"], errors="coerce").fillna(0).astype(float)
+        if "movement_type" in df.columns:
+            # low-cardinality label: lowercased once and stored as category codes
+            df["movement_type"] = df["movement_type"].astype(ARROW_STRING).str.lower().astype("category")
         return df
@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import logging
 
 logger = logging.getLogger("etl.load")
@@ -10,6 +12,10 @@ class DataLoader:
         self.cfg = cfg
         self.out_dir = Path(cfg["output"]["out_dir"]) if cfg.get("output") else Path("./output")
         self.out_dir.mkdir(parents=True, exist_ok=True)
+        out_cfg = cfg.get("output") or {}
+        self.compression = out_cfg.get("compression", "zstd")
+        self.compression_level = out_cfg.get("compression_level")
+        self.row_group_size = out_cfg.get("row_group_size", 256_000)
 
     def save_parquet(self, df, name: str):
         if df is None or getattr(df, 'empty', True):
@@ -17,11 +23,24 @@ class DataLoader:
             return
         path = self.out_dir / f"{name}.parquet"
         try:
-            df.to_parquet(path, index=False)
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            opts = {}
+            if self.compression_level is not None and self._codec_has_levels(self.compression):
+                opts["compression_level"] = self.compression_level
+            pq.write_table(table, path, compression=self.compression, row_group_size=self.row_group_size,
+                           use_dictionary=True, write_statistics=True, **opts)
             logger.info(f"Saved {name} to {path}")
         except Exception as e:
             logger.error(f"Failed to save parquet {name}: {e}")
 
+    @staticmethod
+    def _codec_has_levels(codec) -> bool:
+        # snappy (and "none") reject an explicit level, so it is only passed for codecs that take one
+        try:
+            return pa.Codec.supports_compression_level(codec)
+        except (ValueError, TypeError):
+            return False
+
     def save_csv(self, df, name: str):
         if df is None or getattr(df, 'empty', True):
             logger.info(f"No data to save for {name} (csv)")
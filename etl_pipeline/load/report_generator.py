@@ -1,20 +1,14 @@
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 from pathlib import Path
+import re
 import pandas as pd
+import numpy as np
 import logging
 
 logger = logging.getLogger("etl.report")
 
-class ReportGenerator:
-    def __init__(self, cfg):
-        self.cfg = cfg
-        self.out_dir = Path(cfg["output"]["out_dir"])
-        self.env = Environment(loader=FileSystemLoader(searchpath="."), autoescape=select_autoescape(["html"]))
-
-    def generate_html_report(self, sections: dict):
-        # sections: dict[str, DataFrame]
-        template_str = """
+REPORT_TEMPLATE = """
         <html>
         <head>
           <meta charset="utf-8"/>
@@ -30,17 +24,88 @@ class ReportGenerator:
           <h1>ETL Summary Report</h1>
           {% for k,v in sections.items() %}
             <h2>{{ k }}</h2>
-            {% if v is none or v.empty %}
+            {% if v is none %}
               <p>No data</p>
             {% else %}
-              {{ v.head(10).to_html(classes="table", index=False) | safe }}
+              <table class="table">
+                <thead><tr>{% for c in v.cols %}<th>{{ c }}</th>{% endfor %}</tr></thead>
+                <tbody>
+                {% for row in v.rows %}<tr>{% for c in row %}<td>{{ c }}</td>{% endfor %}</tr>
+                {% endfor %}
+                </tbody>
+              </table>
             {% endif %}
           {% endfor %}
         </body>
         </html>
         """
-        template = self.env.from_string(template_str)
-        rendered = template.render(sections=sections)
+
+PRECISION = 6  # pandas' default display.precision, as used by DataFrame.to_html
+_DECIMAL = re.compile(r"^\s*[+-]?[0-9]+\.[0-9]*$")
+
+def _trim_zeros(strs):
+    # drop trailing zeros shared by every fixed-point value of a column, keeping one digit after "."
+    while True:
+        nums = [s for s in strs if _DECIMAL.match(s)]
+        if not nums or not all(s.endswith("0") for s in nums):
+            break
+        strs = [s[:-1] if _DECIMAL.match(s) else s for s in strs]
+    return [s + "0" if _DECIMAL.match(s) and s.endswith(".") else s for s in strs]
+
+def _format_floats(values: np.ndarray) -> list:
+    # fixed-point, switching the whole column to scientific when a value would round to zero
+    # or large values make it too wide
+    mask = np.isnan(values)
+    fixed = _trim_zeros([f"{v:.{PRECISION}f}" for v in values[~mask]])
+    finite = np.abs(values[~mask])
+    too_long = bool(fixed) and max(len(s) for s in fixed) > PRECISION + 6
+    small = ((finite < 10 ** -PRECISION) & (finite > 0)).any()
+    if small or (too_long and (finite > 1e6).any()):
+        fixed = _trim_zeros([f"{v:.{PRECISION}e}" for v in values[~mask]])
+    it = iter(fixed)
+    return ["NaN" if m else next(it) for m in mask]
+
+def _format_cell(v):
+    if v is None:
+        return "None"
+    if isinstance(v, (float, np.floating)):
+        if np.isnan(v):
+            return "NaN"
+        s = f"{v: .{PRECISION}f}".rstrip("0")
+        return (s + "0" if s.endswith(".") else s).strip()
+    if v is pd.NaT:
+        return "NaT"
+    return str(v)
+
+def _format_column(s: pd.Series) -> list:
+    # per-column cell text matching DataFrame.to_html's default formatting
+    if pd.api.types.is_float_dtype(s.dtype) and isinstance(s.dtype, np.dtype):
+        return _format_floats(s.to_numpy())
+    if pd.api.types.is_datetime64_dtype(s.dtype):
+        valid = s.dropna()
+        if (valid == valid.dt.normalize()).all():
+            return s.dt.strftime("%Y-%m-%d").fillna("NaT").tolist()
+    return [_format_cell(v) for v in s.tolist()]
+
+class ReportGenerator:
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.out_dir = Path(cfg["output"]["out_dir"])
+        self.env = Environment(loader=FileSystemLoader(searchpath="."), autoescape=select_autoescape(["html"]))
+        # compiled once; cells are rendered (and autoescaped) by the template instead of DataFrame.to_html
+        self._tmpl = self.env.from_string(REPORT_TEMPLATE)
+
+    def generate_html_report(self, sections: dict):
+        # sections: dict[str, DataFrame]
+        tables = {}
+        for k, v in sections.items():
+            if v is None or v.empty:
+                tables[k] = None
+            else:
+                head = v.head(10)
+                cols = [_format_column(head[c]) for c in head.columns]
+                tables[k] = {"cols": head.columns.tolist(), "rows": list(zip(*cols))}
+        rendered = self._tmpl.render(sections=tables)
         out_path = self.out_dir / "report.html"
         out_path.write_text(rendered, encoding="utf-8")
         logger.info(f"Wrote HTML report to {out_path}")
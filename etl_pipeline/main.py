@@ -1,6 +1,7 @@
 
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import yaml
 
@@ -30,23 +31,40 @@ def main():
     extractor = DataExtractor(cfg)
     raw_inventory, raw_movements = extractor.extract()
 
-    inv_metrics = InventoryMetrics(cfg)
-    inventory_summary = inv_metrics.run(raw_inventory, raw_movements)
+    # per-product groupings are built once and shared: InventoryMetrics aggregates inventory and takes
+    # the last movement per product from them, FinancialMetrics reuses the inventory group numbers.
+    # ngroups is touched here so the group codes are computed before the worker threads share them.
+    inv_groups = mov_groups = None
+    if "product_id" in raw_inventory.columns:
+        inv_groups = raw_inventory.groupby("product_id", sort=False)
+        inv_groups.ngroups
+    if "product_id" in raw_movements.columns:
+        mov_groups = raw_movements.groupby("product_id", sort=False)
+        mov_groups.ngroups
 
+    inv_metrics = InventoryMetrics(cfg)
     move_analytics = MovementAnalytics(cfg)
-    movement_summary = move_analytics.run(raw_movements)
-
     wh_perf = WarehousePerformance(cfg)
-    warehouse_summary = wh_perf.run(raw_inventory, raw_movements)
-
     fin_metrics = FinancialMetrics(cfg)
-    financial_summary = fin_metrics.run(raw_inventory)
+
+    # the transforms only read the raw frames, so they run side by side (pandas/numpy release the GIL)
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        futures = {
+            "inventory": ex.submit(inv_metrics.run, raw_inventory, raw_movements, groups=inv_groups, movement_groups=mov_groups),
+            "movement": ex.submit(move_analytics.run, raw_movements),
+            "warehouse": ex.submit(wh_perf.run, raw_inventory, raw_movements),
+            "financial": ex.submit(fin_metrics.run, raw_inventory, groups=inv_groups),
+        }
+        summaries = {name: fut.result() for name, fut in futures.items()}
+    inventory_summary = summaries["inventory"]
+    movement_summary = summaries["movement"]
+    warehouse_summary = summaries["warehouse"]
+    financial_summary = summaries["financial"]
 
     loader = DataLoader(cfg)
-    loader.save_parquet(inventory_summary, "inventory_summary")
-    loader.save_parquet(movement_summary, "movement_summary")
-    loader.save_parquet(warehouse_summary, "warehouse_summary")
-    loader.save_parquet(financial_summary, "financial_summary")
+    # parquet writes (compression + file I/O) overlap on a small thread pool
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        list(ex.map(lambda item: loader.save_parquet(item[1], f"{item[0]}_summary"), summaries.items()))
     # also CSV if configured
     if cfg.get("output", {}).get("csv", False):
         loader.save_csv(inventory_summary, "inventory_summary")
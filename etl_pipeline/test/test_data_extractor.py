@@ -0,0 +1,19 @@
+import pandas as pd
+from extract.data_extractor import DataExtractor
+
+def _csv_cfg(tmp_path):
+    return {"sources": {"postgres": {"enabled": False},
+                        "csv": {"enabled": True, "path": str(tmp_path / "movements.csv"), "incremental_column": "modified_date"}},
+            "incremental": {"state_file": str(tmp_path / "state.json")}}
+
+def test_csv_non_iso_timestamps(tmp_path):
+    cfg = _csv_cfg(tmp_path)
+    (tmp_path / "movements.csv").write_text(
+        "product_id,movement_type,quantity,modified_date\n"
+        "1,OUT,5,05/01/2026 10:00\n"
+        "2,IN,3,not a date\n")
+    _, moves = DataExtractor(cfg).extract()
+    # non-ISO dates are parsed; unparseable ones become NaT without dropping the load
+    assert len(moves) == 2
+    assert moves["modified_date"].iloc[0] == pd.Timestamp("2026-05-01 10:00")
+    assert pd.isna(moves["modified_date"].iloc[1])
@@ -0,0 +1,18 @@
+import re
+import html
+import numpy as np
+import pandas as pd
+from load.report_generator import ReportGenerator
+
+def test_report_cells_match_to_html(tmp_path):
+    df = pd.DataFrame({"product_id": [1, 2, 3],
+                       "unit_cost": [55168.841846, 294.0, np.nan],
+                       "inventory_value": [16219640.123, 1.0, 0.5],
+                       "last_movement": pd.to_datetime(["2026-10-01", "2026-10-02", None]),
+                       "class": pd.Categorical(["A", "B", "C"]),
+                       "trend_pct": pd.Series([None, 0.25, -1.0], dtype=object),
+                       "dead_stock": [True, False, False]})
+    ReportGenerator({"output": {"out_dir": str(tmp_path)}}).generate_html_report({"financial": df, "empty": None})
+    cells = re.findall(r"<td>(.*?)</td>", (tmp_path / "report.html").read_text())
+    expected = re.findall(r"<td>(.*?)</td>", df.to_html(index=False))
+    assert [html.unescape(c) for c in cells] == [html.unescape(c) for c in expected]
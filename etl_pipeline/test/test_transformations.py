@@ -1,5 +1,7 @@
 import pandas as pd
 from transform.inventory_metrics import InventoryMetrics
+from transform.financial_metrics import FinancialMetrics
+from transform.movement_analytics import MovementAnalytics
 
 def test_turnover_basic():
     cfg = {"sources":{"csv": {"incremental_column":"modified_date"}}}
@@ -11,3 +13,54 @@ def test_turnover_basic():
     row = out[out.product_id==1].iloc[0]
     # turnover ratio should be 50/100 = 0.5
     assert round(float(row.turnover_ratio), 3) == 0.5
+    # zero on-hand quantity: turnover and DOH are undefined, not an error or inf
+    empty = out[out.product_id==2].iloc[0]
+    assert pd.isna(empty.turnover_ratio)
+    assert pd.isna(empty.doh)
+
+def test_movement_daily_and_trend():
+    cfg = {"sources":{"csv": {"incremental_column":"modified_date"}}}
+    moves = pd.DataFrame([
+        # latest movement is 2026-03-01, so w1 starts 2026-01-30 and w2 starts 2025-12-31 (both inclusive)
+        {"product_id":1, "quantity":4, "modified_date":"2026-03-01 00:00"},
+        {"product_id":1, "quantity":2, "modified_date":"2026-03-01 00:00"},
+        {"product_id":1, "quantity":3, "modified_date":"2026-01-30 00:00"},
+        {"product_id":1, "quantity":5, "modified_date":"2026-01-29 00:00"},
+        {"product_id":1, "quantity":1, "modified_date":"2025-12-31 00:00"},
+        {"product_id":1, "quantity":7, "modified_date":"2025-12-30 00:00"},
+        # same calendar day at different hours is one daily bucket; nothing in w2
+        {"product_id":2, "quantity":2, "modified_date":"2026-02-15 10:00"},
+        {"product_id":2, "quantity":1, "modified_date":"2026-02-15 23:00"},
+    ])
+    out = MovementAnalytics(cfg).run(moves).set_index("product_id")
+    # product 1 daily totals: 6, 3, 5, 1, 7
+    assert out.loc[1, "avg_daily"] == 4.4
+    assert out.loc[1, "peak_daily"] == 7
+    assert out.loc[1, "w1_qty"] == 9
+    assert out.loc[1, "w2_qty"] == 6
+    assert float(out.loc[1, "trend_pct"]) == 0.5
+    assert out.loc[2, "avg_daily"] == 3
+    assert out.loc[2, "peak_daily"] == 3
+    assert out.loc[2, "w1_qty"] == 3
+    assert out.loc[2, "w2_qty"] == 0
+    assert pd.isna(out.loc[2, "trend_pct"])
+
+def test_abc_classes():
+    inv = pd.DataFrame([{"product_id":1, "quantity":80, "unit_cost":1},
+                        {"product_id":2, "quantity":15, "unit_cost":1},
+                        {"product_id":3, "quantity":5, "unit_cost":1}])
+    out = FinancialMetrics({}).run(inv)
+    classes = dict(zip(out.product_id, out["class"].astype(str)))
+    # cumulative share: 0.80 -> A, 0.95 -> B, 1.0 -> C
+    assert classes == {1: "A", 2: "B", 3: "C"}
+
+def test_dead_stock_tz_aware_movements():
+    cfg = {"sources":{"csv": {"incremental_column":"modified_date"}}, "dead_stock_days": 180}
+    inv = pd.DataFrame([{"product_id":1, "quantity":10, "unit_cost":1},
+                        {"product_id":2, "quantity":10, "unit_cost":1}])
+    recent = (pd.Timestamp.now("UTC") - pd.Timedelta(days=1)).isoformat()
+    moves = pd.DataFrame([{"product_id":1, "quantity":1, "movement_type":"out", "modified_date":"2020-01-01T00:00:00Z"},
+                          {"product_id":2, "quantity":1, "movement_type":"out", "modified_date":recent}])
+    out = InventoryMetrics(cfg).run(inv, moves)
+    dead = dict(zip(out.product_id, out.dead_stock))
+    assert dead == {1: True, 2: False}
@@ -9,37 +9,42 @@ class FinancialMetrics:
     def __init__(self, cfg):
         self.cfg = cfg
 
-    def run(self, inventory_df: pd.DataFrame) -> pd.DataFrame:
+    def run(self, inventory_df: pd.DataFrame, groups=None) -> pd.DataFrame:
+        # groups: optional inventory_df.groupby("product_id", sort=False) shared with InventoryMetrics
         if inventory_df is None or inventory_df.empty:
             logger.warning("No inventory for financial metrics")
             return pd.DataFrame()
 
-        df = inventory_df.copy()
-        df.columns = [c.lower() for c in df.columns]
-        if "quantity" not in df.columns:
-            df["quantity"] = 0
-        if "unit_cost" not in df.columns:
-            df["unit_cost"] = 0.0
+        if "product_id" not in inventory_df.columns:
+            logger.warning("Inventory missing product_id for financial metrics")
+            return pd.DataFrame()
 
-        df["inventory_value"] = df["quantity"] * df["unit_cost"]
+        # new columns go through assign, which returns a new frame and leaves the caller's frame
+        # untouched (a lazy copy under pandas Copy-on-Write, a full copy on older pandas)
+        idx = inventory_df.index
+        qty = inventory_df["quantity"] if "quantity" in inventory_df.columns else pd.Series(0, index=idx)
+        unit_cost = inventory_df["unit_cost"] if "unit_cost" in inventory_df.columns else pd.Series(0.0, index=idx)
+        value = qty * unit_cost
 
         # holding cost: assume fixed annual rate (configurable)
         rate = self.cfg.get("holding_cost_rate", 0.20)
-        df["annual_holding_cost"] = df["inventory_value"] * rate
-
-        # ABC analysis by inventory value
-        abc = df.groupby("product_id").inventory_value.sum().reset_index().sort_values("inventory_value", ascending=False)
+        df = inventory_df.assign(quantity=qty, unit_cost=unit_cost, inventory_value=value, annual_holding_cost=value * rate)
+
+        # ABC analysis by inventory value: per-product sums are a bincount over the grouping's
+        # cached group numbers, so product_id is not hashed again
+        if groups is None:
+            groups = inventory_df.groupby("product_id", sort=False)
+        gid = groups.ngroup()
+        valid = gid.notna().to_numpy()
+        sums = np.bincount(gid.to_numpy()[valid].astype(np.int64),
+                           weights=np.nan_to_num(value.to_numpy(dtype=float)[valid]), minlength=groups.ngroups)
+        abc = pd.Series(sums, index=groups.size().index, name="inventory_value").reset_index().sort_values("inventory_value", ascending=False)
         abc["cum_value"] = abc["inventory_value"].cumsum()
         total = abc["inventory_value"].sum()
         abc["pct_cum"] = abc["cum_value"] / (total if total > 0 else 1)
 
-        def label(x):
-            if x <= 0.8:
-                return "A"
-            if x <= 0.95:
-                return "B"
-            return "C"
-
-        abc["class"] = abc["pct_cum"].apply(label)
-        out = df.merge(abc[["product_id", "class"]], how="left", on="product_id")
-        return out
+        # A: <= 80%, B: <= 95%, C: rest -- one searchsorted over the thresholds instead of a per-row apply
+        codes = np.searchsorted([0.8, 0.95], abc["pct_cum"].to_numpy(), side="left")
+        abc["class"] = pd.Categorical.from_codes(codes, categories=["A", "B", "C"])
+        df["class"] = df["product_id"].map(abc.set_index("product_id")["class"])
+        return df
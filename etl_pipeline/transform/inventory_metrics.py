@@ -5,25 +5,33 @@ import logging
 
 logger = logging.getLogger("etl.transform.inventory")
 
+OUTGOING_TYPES = {"out", "sale", "dispatch", "issued"}
+
 class InventoryMetrics:
     def __init__(self, cfg):
         self.cfg = cfg
 
-    def run(self, inventory_df: pd.DataFrame, movements_df: pd.DataFrame) -> pd.DataFrame:
+    def run(self, inventory_df: pd.DataFrame, movements_df: pd.DataFrame, groups=None, movement_groups=None) -> pd.DataFrame:
+        # groups / movement_groups: optional inventory_df / movements_df .groupby("product_id", sort=False)
+        # built once by the caller and shared with the other transforms
         if inventory_df is None or inventory_df.empty:
             logger.warning("No inventory data to compute metrics")
             return pd.DataFrame()
 
-        df = inventory_df.copy()
-        # normalize names
-        df.columns = [c.lower() for c in df.columns]
+        required = ["product_id", "quantity", "unit_cost"]
+        missing = [c for c in required if c not in inventory_df.columns]
+        if missing:
+            logger.warning(f"Inventory missing columns for metrics: {missing}")
+            return pd.DataFrame()
 
-        # group by product
+        # group by product (the aggregation builds a new frame, so no up-front copy is needed)
         group_cols = ["product_id"]
-        if "site_id" in df.columns:
+        if "site_id" in inventory_df.columns:
             group_cols = ["product_id"]  # per-product metrics; adjust if you want per-site
 
-        df = df.groupby(group_cols).agg({
+        if groups is None:
+            groups = inventory_df.groupby(group_cols, sort=False)
+        df = groups.agg({
             "quantity": "sum",
             "unit_cost": "mean"
         }).reset_index()
@@ -33,19 +41,30 @@ class InventoryMetrics:
         # estimate COGS (units) from movements (outgoing)
         df["cogs_quantity"] = 0
         if movements_df is not None and not movements_df.empty and "movement_type" in movements_df.columns:
-            outs = movements_df[movements_df["movement_type"].astype(str).str.lower().isin(["out", "sale", "dispatch", "issued"])]
+            # match on category codes: only the (few) category labels are lowercased and compared
+            mtype = movements_df["movement_type"]
+            if not isinstance(mtype.dtype, pd.CategoricalDtype):
+                mtype = mtype.astype("category")
+            wanted = [i for i, c in enumerate(mtype.cat.categories) if str(c).lower() in OUTGOING_TYPES]
+            outs = movements_df[np.isin(mtype.cat.codes.to_numpy(), wanted)]
             if not outs.empty:
-                cogs_df = outs.groupby("product_id").quantity.sum().reset_index().rename(columns={"quantity": "cogs_quantity"})
-                df = df.merge(cogs_df, how="left", on="product_id")
-                df["cogs_quantity"] = df["cogs_quantity"].fillna(0)
+                # df has one row per product, so a Series lookup replaces the join
+                cogs_series = outs.groupby("product_id", sort=False)["quantity"].sum()
+                df["cogs_quantity"] = df["product_id"].map(cogs_series).fillna(0.0)
         else:
             df["cogs_quantity"] = 0
 
         # turnover ratio = COGS / avg inventory (approx avg = current quantity)
-        df["turnover_ratio"] = np.where(df["quantity"] > 0, df["cogs_quantity"] / df["quantity"], np.nan)
+        # masked np.divide only computes where the denominator is positive (no 0-division, no temporaries)
+        qty = df["quantity"].to_numpy(dtype=float)
+        turnover = np.full(qty.shape, np.nan)
+        np.divide(df["cogs_quantity"].to_numpy(dtype=float), qty, out=turnover, where=qty > 0)
+        df["turnover_ratio"] = turnover
 
         # Days of inventory on hand (DOH) = 365 / turnover_ratio
-        df["doh"] = np.where(df["turnover_ratio"] > 0, 365.0 / df["turnover_ratio"], np.nan)
+        doh = np.full(qty.shape, np.nan)
+        np.divide(365.0, turnover, out=doh, where=turnover > 0)
+        df["doh"] = doh
 
         # Dead stock: product with no movement in last N days (default 180)
         dead_days = self.cfg.get("dead_stock_days", 180)
@@ -53,11 +72,18 @@ class InventoryMetrics:
         if movements_df is not None and not movements_df.empty:
             tcol = self.cfg["sources"]["csv"].get("incremental_column", "modified_date")
             if tcol in movements_df.columns:
-                recent = movements_df.copy()
-                recent[tcol] = pd.to_datetime(recent[tcol], errors="coerce")
-                last_movement = recent.groupby("product_id")[tcol].max().reset_index().rename(columns={tcol: "last_movement"})
-                df = df.merge(last_movement, how="left", on="product_id")
-                df["days_since_last_movement"] = (pd.Timestamp.utcnow() - pd.to_datetime(df["last_movement"])) / pd.Timedelta(days=1)
+                ts = movements_df[tcol]
+                if movement_groups is not None and pd.api.types.is_datetime64_any_dtype(ts):
+                    last_movement = movement_groups[tcol].max()
+                else:
+                    ts = pd.to_datetime(ts, errors="coerce")
+                    last_movement = ts.groupby(movements_df["product_id"], sort=False).max()
+                # compared as naive UTC: offset-aware inputs (e.g. "...Z") are converted
+                if last_movement.dt.tz is not None:
+                    last_movement = last_movement.dt.tz_convert("UTC").dt.tz_localize(None)
+                df["last_movement"] = df["product_id"].map(last_movement)
+                now = pd.Timestamp.now("UTC").tz_localize(None)
+                df["days_since_last_movement"] = (now - df["last_movement"]) / pd.Timedelta(days=1)
                 df["dead_stock"] = df["days_since_last_movement"] > dead_days
 
         out_cols = ["product_id", "quantity", "inventory_value", "turnover_ratio", "doh", "dead_stock"]
@@ -13,39 +13,43 @@ class MovementAnalytics:
             logger.warning("No movement data")
             return pd.DataFrame()
 
-        df = movements_df.copy()
         tcol = self.cfg["sources"]["csv"].get("incremental_column", "modified_date")
-        if tcol in df.columns:
-            df[tcol] = pd.to_datetime(df[tcol], errors="coerce")
-        else:
+        if tcol not in movements_df.columns:
             # fallback: try common timestamp columns
             for cand in ["timestamp", "date", "movement_date"]:
-                if cand in df.columns:
-                    df[cand] = pd.to_datetime(df[cand], errors="coerce")
+                if cand in movements_df.columns:
                     tcol = cand
                     break
+        # work on a narrow frame of the three columns used below instead of copying every column
+        df = pd.DataFrame({
+            "product_id": movements_df["product_id"],
+            "quantity": movements_df["quantity"],
+            tcol: pd.to_datetime(movements_df[tcol], errors="coerce"),
+        })
         df = df.dropna(subset=[tcol, "product_id"])
 
-        df["date"] = df[tcol].dt.date
-        daily = df.groupby(["product_id", "date"]).quantity.sum().reset_index()
+        # day bucket stays datetime64 (int64 under the hood) instead of a Python date object per row
+        df["date"] = df[tcol].dt.floor("D")
 
-        avg_daily = daily.groupby("product_id").quantity.mean().reset_index().rename(columns={"quantity": "avg_daily"})
-        peak = daily.groupby("product_id").quantity.max().reset_index().rename(columns={"quantity": "peak_daily"})
-
-        out = avg_daily.merge(peak, on="product_id", how="left")
-
-        # trend: compare last 30 days vs previous 30 days
-        df = df.sort_values(tcol)
+        # trend: compare last 30 days vs previous 30 days; window quantities are masked per row
+        # so daily totals, peaks and both windows come out of one groupby chain without merges
         latest = df[tcol].max()
-        window1 = df[df[tcol] >= (latest - pd.Timedelta(days=30))]
-        window2 = df[(df[tcol] >= (latest - pd.Timedelta(days=60))) & (df[tcol] < (latest - pd.Timedelta(days=30)))]
-
-        w1 = window1.groupby("product_id").quantity.sum().reset_index().rename(columns={"quantity": "w1_qty"})
-        w2 = window2.groupby("product_id").quantity.sum().reset_index().rename(columns={"quantity": "w2_qty"})
-
-        out = out.merge(w1, how="left", on="product_id").merge(w2, how="left", on="product_id")
-        out["w1_qty"] = out["w1_qty"].fillna(0)
-        out["w2_qty"] = out["w2_qty"].fillna(0)
+        cutoff1 = latest - pd.Timedelta(days=30)
+        cutoff2 = latest - pd.Timedelta(days=60)
+        in_w1 = df[tcol] >= cutoff1
+        in_w2 = (df[tcol] >= cutoff2) & ~in_w1
+        df["q_w1"] = df["quantity"].where(in_w1, 0.0)
+        df["q_w2"] = df["quantity"].where(in_w2, 0.0)
+
+        daily = df.groupby(["product_id", "date"], sort=False)[["quantity", "q_w1", "q_w2"]].sum()
+        out = daily.groupby("product_id", sort=False).agg(
+            avg_daily=("quantity", "mean"),
+            peak_daily=("quantity", "max"),
+            w1_qty=("q_w1", "sum"),
+            w2_qty=("q_w2", "sum"),
+        ).reset_index()
+        # movements are not pre-sorted, so the (small) per-product result is put in id order here
+        out = out.sort_values("product_id", ignore_index=True)
 
         # avoid division by zero
         out["trend_pct"] = None
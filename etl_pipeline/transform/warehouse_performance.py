@@ -13,8 +13,8 @@ class WarehousePerformance:
             logger.warning("No inventory data for warehouse performance")
             return pd.DataFrame()
 
-        inv = inventory_df.copy()
-        inv.columns = [c.lower() for c in inv.columns]
+        # inv is only read, never mutated
+        inv = inventory_df
 
         # ensure site_id present
         if "site_id" not in inv.columns:
@@ -24,7 +24,9 @@ class WarehousePerformance:
             out["utilization"] = out["quantity"] / out["capacity"]
             return out
 
-        inv_agg = inv.groupby("site_id").quantity.sum().reset_index()
+        # inventory is sorted by product, not site: the per-site rows are ordered afterwards
+        inv_agg = inv.groupby("site_id", observed=True, sort=False).quantity.sum().reset_index()
+        inv_agg = inv_agg.sort_values("site_id", ignore_index=True)
         # capacity may not exist in data; use config or default
         inv_agg["capacity"] = inv_agg.get("capacity", self.cfg.get("default_capacity", 100000))
         inv_agg["utilization"] = inv_agg["quantity"] / inv_agg["capacity"]
@@ -32,10 +34,10 @@ class WarehousePerformance:
         transfers = pd.DataFrame()
         if movements_df is not None and not movements_df.empty and "from_site" in movements_df.columns and "to_site" in movements_df.columns:
             moves = movements_df.dropna(subset=["from_site", "to_site", "quantity"])
-            transfers = moves.groupby(["from_site", "to_site"]).quantity.sum().reset_index().rename(columns={"from_site": "src", "to_site": "dst"})
+            transfers = moves.groupby(["from_site", "to_site"], sort=False).quantity.sum().reset_index().rename(columns={"from_site": "src", "to_site": "dst"})
         # merge to provide a view; note: this will widen rows if transfers exist
         if not transfers.empty:
-            out = inv_agg.merge(transfers, how="left", left_on="site_id", right_on="src")
+            out = inv_agg.merge(transfers, how="left", left_on="site_id", right_on="src", sort=False)
         else:
             out = inv_agg
 